@@ -1,20 +1,103 @@
-from typing import List, Union, Mapping, Tuple
-from datetime import datetime
-from subprocess import Popen, PIPE, STDOUT
+from typing import List, Union, Mapping, Tuple, Iterator, Callable, Any, TYPE_CHECKING
+from datetime import datetime, timedelta, timezone
+from subprocess import Popen, PIPE, STDOUT, TimeoutExpired
 import os
+import shutil
 from collections import OrderedDict
-from retry import retry
-from sqlalchemy.engine import Engine
-from sqlalchemy import create_engine
 import json
 from doltpy.core.system_helpers import get_logger, SQL_LOG_FILE
 import csv
 import io
+import threading
+import socket
+import time
+import re
+from functools import lru_cache, wraps
+from contextlib import contextmanager
+
+# orjson is optional, when it is installed JSON query results are decoded with it since it is considerably faster
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+# SQLAlchemy is only imported where the SQL server is used, importing it is slow and most commands never need it
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Engine
 
 logger = get_logger(__name__)
 
 DEFAULT_HOST, DEFAULT_PORT = '127.0.0.1', 3306
 
+# Resolved once so that each command does not search PATH again. The environment is not copied either, passing no env
+# to Popen lets the child inherit ours directly.
+DOLT_BIN = shutil.which('dolt') or 'dolt'
+
+# Commands Dolt also exposes as stored procedures that accept the same arguments as the CLI, e.g. CALL DOLT_ADD('t1').
+# checkout and branch are left out on purpose, as procedures they only change the branch of the session that calls
+# them, while the CLI, and every other connection, would carry on using the branch checked out on disk.
+SQL_PROCEDURE_COMMANDS = {'add', 'commit', 'reset', 'push', 'pull'}
+
+# Statements sent to the server that only read, and so can safely be sent again if the connection drops
+READ_QUERY_KEYWORDS = {'SELECT', 'SHOW'}
+
+# How long, in seconds, the result of a read such as status or log is reused, provided the repo is unchanged on disk
+CACHE_TTL = 60
+
+# How many read results a repo keeps cached, the least recently used is dropped to make room for a new one
+CACHE_SIZE = 128
+
+# How long, in seconds, a server is given to shut down cleanly before it is killed
+SERVER_STOP_TIMEOUT = 5
+
+# Backoff schedule, in seconds, used when waiting for a server to start accepting connections
+SERVER_WAIT_DELAYS = (0.01, 0.02, 0.04, 0.08, 0.16, 0.32, 0.64, 1.28, 2.0, 2.0)
+
+
+# Output of status, log, branch, and remote is parsed with these rather than by repeatedly stripping and splitting lines
+_STATUS_RE = re.compile(
+    r'^\s*(Changes to be committed|Changes not staged for commit|Untracked files|modified|new table|nothing to commit)'
+    r'[:,]?\s*(.*)$'
+)
+_LOG_RE = re.compile(r'^(commit|Merge|Author|Date):?\s+(.*)$')
+_BRANCH_RE = re.compile(r'^(\*?)\s*(\S+)\s+(\S+)')
+_REMOTE_RE = re.compile(r'^\s*(\S+)\s+(\S+)')
+_CREDS_RE = re.compile(r'^(\*?)\s*(\S+)\s+(\S+)')
+# Rows listing tables in ls output are indented, headers such as 'System tables:' and 'No tables in working set' are not.
+# These match the raw output, so lines are neither decoded nor split apart before they are parsed.
+_LS_TABLE_ROW_RE = re.compile(rb'^[ \t]+(\S+)[ \t]+(\S+)[ \t]+(\S+)', re.MULTILINE)
+_LS_SYSTEM_ROW_RE = re.compile(rb'^[ \t]+(\S+)[ \t\r]*$', re.MULTILINE)
+_LS_SYSTEM_HEADER_RE = re.compile(rb'^System.*$', re.MULTILINE)
+
+# Section headers in status output, mapped to whether the changes listed under them are staged
+_STATUS_SECTIONS = {'Changes to be committed': True, 'Changes not staged for commit': False, 'Untracked files': False}
+
+
+# Dates in log output, for example Tue Jul 21 10:53:36 -0700 2020, are built from these rather than parsed by strptime
+_DATE_RE = re.compile(r'^\w{3} (\w{3}) +(\d{1,2}) (\d{2}):(\d{2}):(\d{2}) ([+-])(\d{2})(\d{2}) (\d{4})$')
+_MONTHS = {month: i for i, month in enumerate(['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+                                               'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'], 1)}
+
+
+@lru_cache(maxsize=1024)
+def _parse_commit_date(value: str) -> datetime:
+    match = _DATE_RE.match(value)
+    if not match or match.group(1) not in _MONTHS:
+        return datetime.strptime(value, '%a %b %d %H:%M:%S %z %Y')
+
+    month, day, hour, minute, second, sign, tz_hours, tz_minutes, year = match.groups()
+    offset = timedelta(hours=int(tz_hours), minutes=int(tz_minutes))
+    tz = timezone(-offset if sign == '-' else offset)
+    return datetime(int(year), _MONTHS[month], int(day), int(hour), int(minute), int(second), tzinfo=tz)
+
+
+_LOG_FIELD_PARSERS = {
+    'commit': lambda value: value.split(' ')[0],
+    'Merge': lambda value: tuple(value.split(' ')),
+    'Author': lambda value: value,
+    'Date': _parse_commit_date
+}
+
 
 class DoltException(Exception):
 
@@ -46,16 +129,235 @@ class DoltDirectoryException(Exception):
         self.message = message
 
 
-def _execute(args: List[str], cwd: str):
-    _args = ['dolt'] + args
-    proc = Popen(args=_args, cwd=cwd, stdout=PIPE, stderr=PIPE)
-    out, err = proc.communicate()
-    exitcode = proc.returncode
+def _spawn(args: List[str], cwd: str, **kwargs) -> Popen:
+    """
+    Starts a dolt process, every dolt process is started here. Nothing is passed that would force CPython to fork
+    via the slow path, no preexec_fn, no new session, and no user or group changes, so on Python 3.10+ the child is
+    created with vfork and the cost of starting it does not grow with the memory of this process. os.posix_spawn
+    itself cannot be used, dolt has to run in the repo directory and posix_spawn offers no portable way to set one.
+    :param args:
+    :param cwd:
+    :param kwargs: passed through to Popen
+    :return:
+    """
+    return Popen(args=[DOLT_BIN] + args, cwd=cwd, **kwargs)
+
+
+def _execute(args: List[str], cwd: str, stdin: str = None, write_stdin: Callable[[io.TextIOBase], None] = None):
+    return _execute_bytes(args, cwd, stdin, write_stdin).decode('utf-8')
+
+
+def _execute_bytes(args: List[str],
+                   cwd: str,
+                   stdin: str = None,
+                   write_stdin: Callable[[io.TextIOBase], None] = None) -> bytes:
+    """
+    Executes a dolt command returning its output as raw bytes, for callers that parse the output themselves and only
+    need to decode the parts of it they keep.
+    :param args:
+    :param cwd:
+    :param stdin: text written to the standard input of the process
+    :param write_stdin: called with a text stream connected to the standard input of the process
+    :return:
+    """
+    _args = [DOLT_BIN] + args
+    if write_stdin is not None:
+        out, err, exitcode = _execute_writing_stdin(args, cwd, write_stdin)
+    elif stdin is None:
+        proc = _spawn(args, cwd, stdout=PIPE, stderr=PIPE)
+        out, err = proc.communicate()
+        exitcode = proc.returncode
+    else:
+        proc = _spawn(args, cwd, stdin=PIPE, stdout=PIPE, stderr=PIPE)
+        out, err = proc.communicate(stdin.encode('utf-8'))
+        exitcode = proc.returncode
 
     if exitcode != 0:
         raise DoltException(_args, out, err, exitcode)
 
-    return out.decode('utf-8')
+    return out
+
+
+def _execute_writing_stdin(args: List[str],
+                           cwd: str,
+                           write_stdin: Callable[[io.TextIOBase], None]) -> Tuple[bytes, bytes, int]:
+    """
+    Executes a dolt command while write_stdin writes to its standard input, so input such as the rows of an import can
+    be streamed to dolt as they are produced rather than staged in a file. Stdout and stderr are drained on separate
+    threads so that neither side blocks on a full pipe.
+    :param args:
+    :param cwd:
+    :param write_stdin: called with a text stream connected to the standard input of the process
+    :return:
+    """
+    proc = _spawn(args, cwd, stdin=PIPE, stdout=PIPE, stderr=PIPE)
+    out, err = [], []
+    drains = [threading.Thread(target=lambda stream=stream, buf=buf: buf.append(stream.read()), daemon=True)
+              for stream, buf in [(proc.stdout, out), (proc.stderr, err)]]
+    for drain in drains:
+        drain.start()
+
+    stdin = io.TextIOWrapper(proc.stdin, encoding='utf-8', newline='')
+    try:
+        write_stdin(stdin)
+    except BrokenPipeError:
+        # dolt stopped reading, its exit code and stderr say why
+        pass
+    except BaseException:
+        # Closing stdin would look like the end of the data to dolt, which would then import what it has received so
+        # far, so kill it first
+        proc.kill()
+        raise
+    finally:
+        try:
+            stdin.close()
+        except BrokenPipeError:
+            pass
+        exitcode = proc.wait()
+        for drain in drains:
+            drain.join()
+        proc.stdout.close()
+        proc.stderr.close()
+
+    return b''.join(out), b''.join(err), exitcode
+
+
+def _execute_lines(args: List[str], cwd: str) -> Iterator[str]:
+    """
+    Executes a dolt command yielding its output line by line as it is produced, rather than buffering it all in memory
+    first. Stderr is drained on a separate thread so that a chatty process cannot block on a full pipe.
+    :param args:
+    :param cwd:
+    :return:
+    """
+    _args = [DOLT_BIN] + args
+    proc = _spawn(args, cwd, stdout=PIPE, stderr=PIPE, bufsize=16 * 1024, universal_newlines=True)
+    err = []
+    drain = threading.Thread(target=lambda: err.append(proc.stderr.read()), daemon=True)
+    drain.start()
+
+    try:
+        for line in proc.stdout:
+            yield line.rstrip('\n')
+    finally:
+        proc.stdout.close()
+        exitcode = proc.wait()
+        drain.join()
+        proc.stderr.close()
+
+    if exitcode != 0:
+        raise DoltException(_args, None, ''.join(err), exitcode)
+
+
+class _Output:
+    """
+    The output of a dolt command. The text is kept as produced and only split into lines when they are used, so callers
+    that need the whole output, for example to parse it as CSV or JSON, do not split it only to join it back together.
+    """
+    __slots__ = ('text', '_lines')
+
+    def __init__(self, text: str):
+        self.text = text
+        self._lines = None
+
+    @property
+    def lines(self) -> List[str]:
+        if self._lines is None:
+            self._lines = self.text.splitlines()
+        return self._lines
+
+    def __iter__(self):
+        return iter(self.lines)
+
+    def __len__(self):
+        return len(self.lines)
+
+    def __getitem__(self, item):
+        return self.lines[item]
+
+
+def _as_list(value) -> list:
+    """
+    Normalizes an argument that may be a single value or a list of values, such as table_or_tables, into a list.
+    :param value:
+    :return:
+    """
+    if isinstance(value, (str, os.PathLike)):
+        return [value]
+    return list(value) if value else []
+
+
+def _procedure_call(args: List[str]) -> str:
+    """
+    Translates the arguments of a dolt command into a call to the equivalent stored procedure, for example
+    ['commit', '-m', 'msg'] becomes CALL DOLT_COMMIT('-m', 'msg').
+    :param args:
+    :return:
+    """
+    command, params = args[0], args[1:]
+    quoted = ["'{}'".format(str(param).replace('\\', '\\\\').replace("'", "\\'")) for param in params]
+    return 'CALL DOLT_{}({})'.format(command.upper(), ', '.join(quoted))
+
+
+def _quote_identifier(name: str) -> str:
+    return '`{}`'.format(name.replace('`', '``'))
+
+
+def _sql_statement(args: List[str]) -> Union[str, None]:
+    """
+    Translates the arguments of a dolt command into an equivalent SQL statement, or returns None if the command has no
+    SQL equivalent and must be run by the CLI. Commands in SQL_PROCEDURE_COMMANDS become stored procedure calls, and
+    table rm and table mv become DROP TABLE and RENAME TABLE.
+    :param args:
+    :return:
+    """
+    if args[0] in SQL_PROCEDURE_COMMANDS:
+        return _procedure_call(args)
+
+    if args[0] == 'table' and len(args) > 2:
+        subcommand, params = args[1], args[2:]
+        if any(param.startswith('-') for param in params):
+            return None
+        if subcommand == 'rm':
+            return 'DROP TABLE {}'.format(', '.join(_quote_identifier(table) for table in params))
+        if subcommand == 'mv' and len(params) == 2:
+            return 'RENAME TABLE {} TO {}'.format(*[_quote_identifier(table) for table in params])
+
+    return None
+
+
+def _is_read_query(query: str) -> bool:
+    """
+    Whether query only reads, so that running it a second time has no effect beyond the first.
+    :param query:
+    :return:
+    """
+    return query.lstrip().split(None, 1)[0].upper() in READ_QUERY_KEYWORDS
+
+
+def _engine_reaches_server(server_config: 'ServerConfig') -> bool:
+    """
+    Whether the engine doltpy creates, which connects as root without a password to the database named after the repo on
+    server_config.host and server_config.port, can reach a server started with server_config.
+    :param server_config:
+    :return:
+    """
+    return not (server_config.config or server_config.multi_db_dir or server_config.user or server_config.password)
+
+
+def _cached_read(method):
+    """
+    Caches the result of a method that reads the state of the repo, see Dolt.cached_read for when results are reused. The
+    cached object is returned as is, so callers should not modify it.
+    :param method:
+    :return:
+    """
+    @wraps(method)
+    def inner(self, *args, **kwargs):
+        key = (method.__name__, args, tuple(sorted(kwargs.items())))
+        return self.cached_read(key, lambda: method(self, *args, **kwargs))
+
+    return inner
 
 
 class DoltStatus:
@@ -74,6 +376,8 @@ class DoltTable:
     """
     Represents a Dolt table in the working set.
     """
+    __slots__ = ('name', 'table_hash', 'rows', 'system')
+
     def __init__(self, name: str, table_hash: str = None, rows: int = None, system: bool = False):
         self.name = name
         self.table_hash = table_hash
@@ -81,10 +385,10 @@ class DoltTable:
         self.system = system
 
     def __str__(self):
-        return 'DoltTable(name: {}, table_hash: , rows: {}, system: {}'.format(self.name,
-                                                                               self.table_hash,
-                                                                               self.rows,
-                                                                               self.system)
+        return 'DoltTable(name: {}, table_hash: {}, rows: {}, system: {})'.format(self.name,
+                                                                                 self.table_hash,
+                                                                                 self.rows,
+                                                                                 self.system)
 
 class DoltCommit:
     """
@@ -168,9 +472,16 @@ class Dolt:
 
     def __init__(self, repo_dir: str, server_config: ServerConfig = ServerConfig()):
         self._repo_dir = repo_dir
+        # The database name the server exposes this repo as, the repo dir never changes so it is only computed once
+        self._repo_name = os.path.basename(os.path.normpath(repo_dir)).replace('-', '_')
         self.server = None
+        self._server_log = None
         self.server_config = server_config
-        self.engine = self._get_engine()
+        self._engine = None
+        self._conn = None
+        self._pipeline = None
+        self._cache = OrderedDict()
+        self._lock = threading.RLock()
 
         error_message = '{} is not a valid Dolt repository'.format(self.repo_dir())
         assert os.path.exists(os.path.join(self.repo_dir(), '.dolt')), error_message
@@ -182,38 +493,61 @@ class Dolt:
         """
         return self._repo_dir
 
-    def execute(self, args: List[str], print_output: bool = True, restart_server: bool = False) -> List[str]:
+    def execute(self,
+                args: List[str],
+                print_output: bool = True,
+                restart_server: bool = False,
+                write_stdin: Callable[[io.TextIOBase], None] = None,
+                read_only: bool = False) -> _Output:
         """
         Manages executing a dolt command, pass all commands, sub-commands, and arguments as they would appear on the
         command line.
         :param args:
         :param print_output:
         :param restart_server:
+        :param write_stdin: optionally called with a text stream connected to the standard input of the command
+        :param read_only: the command does not modify the repo, so results cached before it are kept
         :return:
         """
-        was_serving = False
-        if restart_server and self.server is not None:
-            was_serving = True
-            self.sql_server_stop()
+        # Commands are executed one at a time, dolt processes writing to the same repo concurrently would overwrite
+        # each other's changes to the working set
+        with self._lock:
+            # Any other command may modify the repo, so reads cached before it cannot be trusted
+            if not read_only:
+                self._cache.clear()
 
-        output = _execute(args, self.repo_dir())
+            statement = _sql_statement(args) if write_stdin is None and not read_only else None
 
-        if print_output:
-            logger.info(output)
+            if self._pipeline is not None:
+                if statement is not None:
+                    self._pipeline.append(statement)
+                    return _Output('')
 
-        @retry(exceptions=Exception, delay=2, tries=10)
-        def verify_connection():
-            with self.engine.connect() as _:
-                logger.info('Verified database server running')
+                # Commands that cannot be queued must see the effect of those queued before them, so run those first
+                self._flush_pipeline()
+
+            # The running server can execute these itself, which avoids stopping it and waiting for it to come back up
+            if self._serving_sql() and statement is not None:
+                self._sql_query(statement)
+                return _Output('')
+
+            was_serving = False
+            if restart_server and self.server is not None:
+                was_serving = True
+                self.sql_server_stop()
+
+            output = _execute(args, self.repo_dir(), write_stdin=write_stdin)
 
-        if was_serving:
-            # TODO:
-            #   this is a a problem because we restart with different parameters, solution is to
-            #   to store a config object on the repo
-            self.sql_server()
-            verify_connection()
+            if print_output:
+                logger.info(output)
 
-        return output.split('\n')
+            if was_serving:
+                # TODO:
+                #   this is a a problem because we restart with different parameters, solution is to
+                #   to store a config object on the repo
+                self.sql_server()
+
+            return _Output(output)
 
     @staticmethod
     def init(repo_dir: str = None, server_config: ServerConfig = ServerConfig()) -> 'Dolt':
@@ -242,6 +576,67 @@ class Dolt:
     def version():
         return _execute(['version'], cwd=os.getcwd()).split(' ')[2].strip()
 
+    def _state_stamp(self) -> Tuple[Tuple[str, int, int], ...]:
+        """
+        Names, sizes and modification times of the files in the chunk store and of the repo state file, which change
+        whenever data, the working set, or the checked out branch change. Every file is stated, not just the chunk store
+        directory, since data appended to an existing file, such as the manifest or the chunk journal, does not change
+        the modification time of the directory.
+        :return:
+        """
+        dot_dolt = os.path.join(self.repo_dir(), '.dolt')
+        stamp = []
+        try:
+            with os.scandir(os.path.join(dot_dolt, 'noms')) as entries:
+                for entry in entries:
+                    if entry.is_file():
+                        stat = entry.stat()
+                        stamp.append((entry.name, stat.st_size, stat.st_mtime_ns))
+        except FileNotFoundError:
+            pass
+        stamp.sort()
+
+        repo_state = os.path.join(dot_dolt, 'repo_state.json')
+        if os.path.exists(repo_state):
+            stat = os.stat(repo_state)
+            stamp.append(('repo_state.json', stat.st_size, stat.st_mtime_ns))
+
+        return tuple(stamp)
+
+    def cached_read(self, key: tuple, compute: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for key, or compute and cache it. Cached values are reused for at most CACHE_TTL seconds,
+        and only while the repo is unchanged on disk and no command has been executed through this object. At most
+        CACHE_SIZE values are kept, the least recently used is dropped first. Nothing is cached while the SQL server is
+        running, since reads are then served by the server. The cached value itself is returned, so callers should not
+        modify it.
+        :param key: hashable key identifying the read, including any arguments it depends on
+        :param compute: performs the read, it should run dolt commands through execute with read_only set
+        :return:
+        """
+        if self.server is not None:
+            return compute()
+
+        # Taken so that a command executing on another thread cannot clear the cache, or change the repo, between
+        # reading the stamp and storing the value computed for it
+        with self._lock:
+            stamp = self._state_stamp()
+            entry = self._cache.get(key)
+            if entry is not None:
+                cached_at, cached_stamp, value = entry
+                if cached_stamp == stamp and time.monotonic() - cached_at < CACHE_TTL:
+                    self._cache.move_to_end(key)
+                    return value
+
+            value = compute()
+            self._cache[key] = (time.monotonic(), stamp, value)
+            self._cache.move_to_end(key)
+            if len(self._cache) > CACHE_SIZE:
+                self._cache.popitem(last=False)
+
+            return value
+
+    @_cached_read
     def status(self) -> DoltStatus:
         """
         Parses the status of this repository into a `DoltStatus` object.
@@ -249,26 +644,32 @@ class Dolt:
         """
         new_tables, changes = {}, {}
 
-        output = self.execute(['status'], print_output=False)
+        if self._serving_sql():
+            rows = self._sql_query('SELECT table_name, staged, status FROM dolt_status')
+            for row in rows:
+                if row['status'] == 'new table':
+                    new_tables[row['table_name']] = bool(row['staged'])
+                elif row['status'] == 'modified':
+                    changes[row['table_name']] = bool(row['staged'])
+            return DoltStatus(not rows, changes, new_tables)
+
+        is_clean, staged = False, False
+        tables_by_change = {'modified': changes, 'new table': new_tables}
+        for line in _execute_lines(['status'], self.repo_dir()):
+            match = _STATUS_RE.match(line)
+            if not match:
+                continue
+
+            tag, table = match.groups()
+            if tag in _STATUS_SECTIONS:
+                staged = _STATUS_SECTIONS[tag]
+            elif tag == 'nothing to commit':
+                is_clean = True
+            else:
+                tables_by_change[tag][table] = staged
 
-        if 'clean' in str('\n'.join(output)):
-            return DoltStatus(True, changes, new_tables)
-        else:
-            staged = False
-            for line in output:
-                _line = line.lstrip()
-                if _line.startswith('Changes to be committed'):
-                    staged = True
-                elif _line.startswith('Changes not staged for commit'):
-                    staged = False
-                elif _line.startswith('Untracked files'):
-                    staged = False
-                elif _line.startswith('modified'):
-                    changes[_line.split(':')[1].lstrip()] = staged
-                elif _line.startswith('new table'):
-                    new_tables[_line.split(':')[1].lstrip()] = staged
-                else:
-                    pass
+        if is_clean:
+            return DoltStatus(True, {}, {})
 
         return DoltStatus(False, changes, new_tables)
 
@@ -278,11 +679,7 @@ class Dolt:
         :param table_or_tables:
         :return:
         """
-        if type(table_or_tables) == str:
-            to_add = [table_or_tables]
-        else:
-            to_add = table_or_tables
-        self.execute(["add"] + to_add, restart_server=True)
+        self.execute(["add"] + _as_list(table_or_tables), restart_server=True)
         return self.status()
 
     def reset(self, table_or_tables: Union[str, List[str]], hard: bool = False, soft: bool = False):
@@ -294,11 +691,6 @@ class Dolt:
         :param soft:
         :return:
         """
-        if type(table_or_tables) == str:
-            to_reset = [table_or_tables]
-        else:
-            to_reset = table_or_tables
-
         args = ['reset']
 
         assert not(hard and soft), 'Cannot reset hard and soft'
@@ -308,7 +700,7 @@ class Dolt:
         if soft:
             args.append('--soft')
 
-        self.execute(args + to_reset)
+        self.execute(args + _as_list(table_or_tables))
 
     def commit(self, message: str = None, allow_empty: bool = False, date: datetime = None):
         """
@@ -348,17 +740,17 @@ class Dolt:
         args = ['merge']
 
         if squash:
-            args = args.append('--squash')
+            args.append('--squash')
 
         args.append(branch)
         output = self.execute(args)
         merge_conflict_pos = 2
 
-        if len(output) == 3 and 'Fast-forward' in output[1]:
+        if len(output) == 2 and 'Fast-forward' in output[1]:
             logger.info('Completed fast-forward merge of {} into {}'.format(branch, current_branch.name))
             return
 
-        if len(output) == 5 and output[merge_conflict_pos].startswith('CONFLICT'):
+        if len(output) == 4 and output[merge_conflict_pos].startswith('CONFLICT'):
             logger.warning('The following merge conflict occurred merging {} to {}:\n'.format(branch,
                                                                                               current_branch.name,
                                                                                               output[merge_conflict_pos]))
@@ -425,12 +817,12 @@ class Dolt:
             if result_format in ['csv', 'tabular']:
                 args.extend(['--result-format', 'csv'])
                 output = self.execute(args)
-                dict_reader = csv.DictReader(io.StringIO('\n'.join(output)))
+                dict_reader = csv.DictReader(io.StringIO(output.text))
                 return list(dict_reader)
             elif result_format == 'json':
                 args.extend(['--result-format', 'json'])
                 output = self.execute(args)
-                return json.load(io.StringIO('\n'.join(output)))
+                return _json_loads(output.text)
             else:
                 raise ValueError('{} is not a valid value for result_format'.format(result_format))
 
@@ -438,17 +830,148 @@ class Dolt:
         args.extend(['--query', query])
         self.execute(args)
 
+    def batch_sql(self, statements: List[str]):
+        """
+        Execute a list of SQL statements one after the other in a single dolt process, using batch mode, or against the
+        SQL server if this repo is running one. The statements are written to the standard input of the dolt process
+        rather than passed as an argument, so there is no limit on how many can be batched.
+        :param statements: statements to execute, without a trailing ;
+        :return:
+        """
+        if self._serving_sql():
+            for statement in statements:
+                self._sql_query(statement)
+            return
+
+        self._cache.clear()
+        script = ';\n'.join(statements) + ';\n'
+        logger.info(_execute(['sql', '--batch'], self.repo_dir(), stdin=script))
+
+    @contextmanager
+    def pipeline(self):
+        """
+        Within this context add, commit, reset, push, pull, table rm, and table mv are not executed immediately, they
+        are queued as the equivalent SQL statements and executed in a single batch when the context exits. Any other
+        command, for example a checkout or an import, first executes the commands queued so far and then runs, so
+        commands always take effect in the order they were issued. Methods that return the state of the repo, for
+        example add returning status, return the state before the queued commands run. If an exception is raised inside
+        the context the commands still queued are discarded.
+        :return:
+        """
+        assert self._pipeline is None, 'Cannot nest pipelines'
+        self._pipeline = []
+        try:
+            yield self
+            statements = self._pipeline
+        finally:
+            self._pipeline = None
+
+        if statements:
+            self.batch_sql(statements)
+
+    def _flush_pipeline(self):
+        """
+        Execute the commands queued by the active pipeline, leaving it open with an empty queue.
+        :return:
+        """
+        statements, self._pipeline = self._pipeline, []
+        if statements:
+            self.batch_sql(statements)
+
     def _parse_tabluar_output_to_dict(self, args: List[str]):
         args.extend(['--result-format', 'csv'])
         output = self.execute(args)
-        dict_reader = csv.DictReader(io.StringIO('\n'.join(output)))
+        dict_reader = csv.DictReader(io.StringIO(output.text))
         return list(dict_reader)
 
+    def _sql_query(self, query: str) -> List[dict]:
+        """
+        Execute a query against the SQL server this repo is running, returning the result rows as dicts. Used to read
+        metadata from the Dolt system tables rather than forking a new dolt process for each read.
+        :param query:
+        :return:
+        """
+        from sqlalchemy import text
+        from sqlalchemy.exc import OperationalError, InterfaceError
+
+        if self.server is None:
+            raise DoltServerNotRunningException('Cannot execute {}, server is not running'.format(query))
+
+        def execute_reconnecting(statement: str):
+            try:
+                return self._connection().execute(text(statement))
+            except (OperationalError, InterfaceError):
+                # the server may have dropped the connection, for example after a timeout, so reconnect and retry once
+                self._close_connection()
+                return self._connection().execute(text(statement))
+
+        if _is_read_query(query):
+            result = execute_reconnecting(query)
+        else:
+            # The connection may drop after the server applied a statement that changes the repo, so such a statement is
+            # never sent twice, instead check the connection is alive, reconnecting if it is not, before sending it once
+            execute_reconnecting('SELECT 1')
+            result = self._connection().execute(text(query))
+
+        return [dict(row) for row in result] if result.returns_rows else []
+
+    def _connection(self):
+        """
+        Returns the connection held open to the server this repo is running, opening it on first use. Reusing a single
+        connection means queries do not pay for a handshake, or for the session reset a pooled connection gets when it
+        is checked out. Each statement is committed as soon as it executes.
+        :return:
+        """
+        if self._conn is None:
+            self._conn = self.get_engine().connect().execution_options(autocommit=True)
+        return self._conn
+
+    def _close_connection(self):
+        from sqlalchemy.exc import OperationalError, InterfaceError
+
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except (OperationalError, InterfaceError):
+                pass
+            self._conn = None
+
+    def _serving_sql(self) -> bool:
+        """
+        Whether the repo is running a server that commands and reads can be sent to as SQL. The engine connects as root
+        to the database named after the repo on the configured host and port, so a server started from a config file,
+        serving a multi-db dir, or requiring a user does not qualify and the CLI is used instead.
+        :return:
+        """
+        return self.server is not None and _engine_reaches_server(self.server_config)
+
+    def _verify_connection(self):
+        """
+        Block until the server this repo is running accepts connections, backing off exponentially between attempts. A
+        plain socket is used to probe the port, and the engine is only used to connect once the port is open.
+        :return:
+        """
+        from sqlalchemy import text
+        from sqlalchemy.exc import OperationalError, InterfaceError
+
+        address = (self.server_config.host, self.server_config.port)
+        for delay in SERVER_WAIT_DELAYS:
+            try:
+                socket.create_connection(address, timeout=0.1).close()
+                self._connection().execute(text('SELECT 1'))
+                logger.info('Verified database server running')
+                return
+            except (OSError, OperationalError, InterfaceError):
+                self._close_connection()
+                time.sleep(delay)
+
+        raise DoltServerNotRunningException('Server on {}:{} did not accept connections'.format(*address))
+
     def sql_server(self):
         """
         Start a MySQL Server process on local host using the parameters to configure behavior. The parameters are
         self-explanatory, but the config is a way to provide them as a YAML file rather than as function
-        arguments.
+        arguments. Returns once the server accepts connections.
         :return:
         """
         def start_server(server_args):
@@ -457,10 +980,8 @@ class Dolt:
 
             log_file = SQL_LOG_FILE or os.path.join(self.repo_dir(), 'mysql_server.log')
 
-            proc = Popen(args=['dolt'] + server_args,
-                         cwd=self.repo_dir(),
-                         stdout=open(log_file, 'w'),
-                         stderr=STDOUT)
+            self._server_log = open(log_file, 'w')
+            proc = _spawn(server_args, self.repo_dir(), stdout=self._server_log, stderr=STDOUT)
 
             self.server = proc
 
@@ -490,11 +1011,20 @@ class Dolt:
 
         start_server(args)
 
+        # Reads are served by the server as soon as it is set, so do not return before it accepts connections
+        if self._serving_sql():
+            try:
+                self._verify_connection()
+            except Exception:
+                # Leave no server behind that reads would be routed to but could not reach
+                self.sql_server_stop()
+                raise
+
     @property
     def repo_name(self):
-        return str(self.repo_dir()).split('/')[-1].replace('-', '_')
+        return self._repo_name
 
-    def _get_engine(self) -> Engine:
+    def _get_engine(self) -> 'Engine':
         """
         Get a connection to ths server process that this repo is running, raise an exception if it is not running.
         :param echo:
@@ -506,17 +1036,32 @@ class Dolt:
 
         logger.info('Creating engine for Dolt SQL Server instance running on {}:{}'.format(host, port))
 
+        from sqlalchemy import create_engine
+
         def inner():
             return create_engine('mysql+mysqlconnector://{user}@{host}:{port}/{database}'.format(user='root',
                                                                                                  host=host,
                                                                                                  port=port,
                                                                                                  database=database),
-                                 echo=self.server_config.echo)
+                                 echo=self.server_config.echo,
+                                 pool_pre_ping=True,
+                                 pool_recycle=3600)
 
         return inner()
 
-    def get_engine(self):
-        return self.engine
+    def get_engine(self) -> 'Engine':
+        """
+        Returns the engine for the server this repo runs, creating it on first use and reusing it, along with its
+        connection pool, on every subsequent call.
+        :return:
+        """
+        if self._engine is None:
+            self._engine = self._get_engine()
+        return self._engine
+
+    @property
+    def engine(self) -> 'Engine':
+        return self.get_engine()
 
     def sql_server_stop(self):
         """
@@ -527,9 +1072,28 @@ class Dolt:
             logger.warning("Server is not running")
             return
 
-        self.server.kill()
+        self._close_connection()
+
+        # A server that is killed outright leaves the repo to be recovered the next time one starts, so ask it to exit
+        # first, and only kill it if it does not do so in time
+        self.server.terminate()
+        try:
+            self.server.wait(timeout=SERVER_STOP_TIMEOUT)
+        except TimeoutExpired:
+            logger.warning('Server did not exit within {} seconds, killing it'.format(SERVER_STOP_TIMEOUT))
+            self.server.kill()
+            self.server.wait()
         self.server = None
 
+        if self._server_log is not None:
+            self._server_log.close()
+            self._server_log = None
+
+        # Pooled connections point at the process we just killed, drop them so the next server starts with a clean pool
+        if self._engine is not None:
+            self._engine.dispose()
+
+    @_cached_read
     def log(self, number: int = None, commit: str = None) -> OrderedDict:
         """
         Parses the log created by running the log command into instances of `DoltCommit` that provide detail of the
@@ -540,32 +1104,24 @@ class Dolt:
         """
         args = ['log']
 
-        if number:
-            args.extend(['--number', number])
+        if number is not None:
+            args.extend(['--number', str(number)])
         if commit:
             raise NotImplementedError()
 
-        output = self.execute(args, print_output=False)
         result = OrderedDict()
-        for i, line in enumerate(output):
-            if line.startswith('commit'):
-                if output[i + 1].startswith('Merge'):
-                    offsets = (1, 2, 3, 5)
-                else:
-                    offsets = (None, 1, 2, 4)
-
-                merge_pos, author_offset, date_offset, message_offset = offsets
-
-                current_commit = line.split(' ')[1]
-                merge = None
-                if merge_pos:
-                    merge = tuple(output[merge_pos].split(':')[1].lstrip().split(' '))
-                author = output[i + author_offset].split(':')[1].lstrip()
-                date = datetime.strptime(output[i + date_offset].split(':', maxsplit=1)[1].lstrip(),
-                                         '%a %b %d %H:%M:%S %z %Y')
-                message = output[i + message_offset].lstrip('\t')
-                assert current_commit is not None and date is not None and author is not None and message is not None
-                result[current_commit] = DoltCommit(current_commit, date, author, message, merge)
+        fields = {}
+        for line in _execute_lines(args, self.repo_dir()):
+            match = _LOG_RE.match(line)
+            if match:
+                tag, value = match.groups()
+                if tag == 'commit':
+                    fields = {}
+                fields[tag] = _LOG_FIELD_PARSERS[tag](value)
+            elif line and 'Date' in fields and fields['commit'] not in result:
+                # the first non-empty line following the date is the commit message
+                ref = fields['commit']
+                result[ref] = DoltCommit(ref, fields['Date'], fields['Author'], line.lstrip('\t'), fields.get('Merge'))
 
         return result
 
@@ -596,24 +1152,21 @@ class Dolt:
         switch_count = [el for el in [data, schema, summary] if el]
         assert len(switch_count) <= 1, 'At most one of delete, copy, move can be set to True'
 
-        if type(table_or_tables) == str:
-            tables = [table_or_tables]
-        else:
-            tables = table_or_tables
+        tables = _as_list(table_or_tables)
 
         args = ['diff']
 
         if data:
             if where:
                 args.extend(['--where', where])
-            if limit:
-                args.extend(['--limit', limit])
+            if limit is not None:
+                args.extend(['--limit', str(limit)])
 
         if summary:
             args.append('--summary')
 
         if schema:
-            args.extend('--schema')
+            args.append('--schema')
 
         if sql:
             args.append('--sql')
@@ -624,7 +1177,7 @@ class Dolt:
             args.append(other_commit)
 
         if tables:
-            args.append(' '.join(tables))
+            args.extend(tables)
 
         self.execute(args)
 
@@ -674,7 +1227,7 @@ class Dolt:
             args.append('--force')
 
         def execute_wrapper(command_args: List[str]):
-            self.execute(command_args)
+            self.execute(command_args, restart_server=True)
             return self._get_branches()
 
         if branch_name and not(delete or copy or move):
@@ -713,22 +1266,26 @@ class Dolt:
         return self._get_branches()
 
 
+    @_cached_read
     def _get_branches(self) -> Tuple[DoltBranch, List[DoltBranch]]:
+        if self._serving_sql():
+            active_name = self._sql_query('SELECT active_branch() AS name')[0]['name']
+            branches = [DoltBranch(row['name'], row['hash'])
+                        for row in self._sql_query('SELECT name, hash FROM dolt_branches')]
+            active_branch = next((branch for branch in branches if branch.name == active_name), None)
+            return active_branch, branches
+
         args = ['branch', '--list', '--verbose']
-        output = self.execute(args)
         branches, active_branch = [], None
-        for line in output:
-            if not line:
+        for line in _execute_lines(args, self.repo_dir()):
+            match = _BRANCH_RE.match(line)
+            if not match:
                 break
-            elif line.startswith('*'):
-                split = line.lstrip()[1:].split()
-                branch, commit = split[0], split[1]
-                active_branch = DoltBranch(branch, commit)
-                branches.append(active_branch)
-            else:
-                split = line.lstrip().split()
-                branch, commit = split[0], split[1]
-                branches.append(DoltBranch(branch, commit))
+
+            active, branch, commit = match.groups()
+            branches.append(DoltBranch(branch, commit))
+            if active:
+                active_branch = branches[-1]
 
         return active_branch, branches
 
@@ -747,11 +1304,7 @@ class Dolt:
         :return:
         """
         args = ['checkout']
-
-        if type(table_or_tables) == str:
-            tables = [table_or_tables]
-        else:
-            tables = table_or_tables
+        tables = _as_list(table_or_tables)
 
         if branch:
             assert not table_or_tables, 'No table_or_tables '
@@ -763,7 +1316,7 @@ class Dolt:
 
         if tables:
             assert not branch, 'Passing a branch not compatible with tables'
-            args.append(' '.join(tables))
+            args.extend(tables)
 
         self.execute(args, restart_server=True)
 
@@ -780,15 +1333,17 @@ class Dolt:
         args = ['remote', '--verbose']
 
         if not(add or remove):
-            output = self.execute(args, print_output=False)
+            if self._serving_sql():
+                return [DoltRemote(row['name'], row['url'])
+                        for row in self._sql_query('SELECT name, url FROM dolt_remotes')]
 
             remotes = []
-            for line in output:
-                if not line:
+            for line in _execute_lines(args, self.repo_dir()):
+                match = _REMOTE_RE.match(line)
+                if not match:
                     break
 
-                split = line.lstrip().split()
-                remotes.append(DoltRemote(split[0], split[1]))
+                remotes.append(DoltRemote(*match.groups()))
 
             return remotes
 
@@ -846,17 +1401,11 @@ class Dolt:
         """
         args = ['fetch']
 
-        if type(refspec_or_refspecs) == str:
-            refspecs = [refspec_or_refspecs]
-        else:
-            refspecs = refspec_or_refspecs
-
         if force:
             args.append('--force')
         if remote:
             args.append(remote)
-        if refspec_or_refspecs:
-            args.extend(refspecs)
+        args.extend(_as_list(refspec_or_refspecs))
 
         self.execute(args)
 
@@ -906,7 +1455,7 @@ class Dolt:
             for out in output:
                 logger.info(out)
         else:
-            raise ValueError('Unexpected output: \n{}'.format('\n'.join(output)))
+            raise ValueError('Unexpected output: \n{}'.format(output.text))
 
         return True
 
@@ -920,7 +1469,7 @@ class Dolt:
 
         output = self.execute(args, print_output=False)
 
-        if output[0].startswith('failed'):
+        if output and output[0].startswith('failed'):
             logger.error(output[0])
             raise DoltException('Tried to remove non-existent creds')
 
@@ -937,14 +1486,10 @@ class Dolt:
 
         creds = []
         for line in output:
-            if line.startswith('*'):
-                active = True
-                split = line[1:].lstrip().split(' ')
-            else:
-                active = False
-                split = line.lstrip().split(' ')
-
-            creds.append(DoltKeyPair(split[0], split[1], active))
+            match = _CREDS_RE.match(line)
+            if match:
+                active, public_key, key_id = match.groups()
+                creds.append(DoltKeyPair(public_key, key_id, bool(active)))
 
         return creds
 
@@ -955,17 +1500,17 @@ class Dolt:
         :param creds: creds identified by public key ID
         :return:
         """
-        args = ['dolt', 'creds', 'check']
+        args = ['creds', 'check']
 
         if endpoint:
             args.extend(['--endpoint', endpoint])
         if creds:
             args.extend(['--creds', creds])
 
-        output = _execute(args, self.repo_dir())
+        output = _Output(_execute(args, self.repo_dir()))
 
-        if output[3].startswith('error'):
-            logger.error('\n'.join(output[3:]))
+        if len(output) > 3 and output[3].startswith('error'):
+            logger.error(output.text.split('\n', 3)[-1])
             return False
 
         return True
@@ -978,10 +1523,10 @@ class Dolt:
         """
         args = ['creds', 'use', public_key_id]
 
-        output = _execute(args, self.repo_dir())
+        output = _Output(_execute(args, self.repo_dir()))
 
         if output and output[0].startswith('error'):
-            logger.error('\n'.join(output[3:]))
+            logger.error(output.text.split('\n', 3)[-1])
             raise DoltException('Bad public key')
 
         return True
@@ -1085,7 +1630,7 @@ class Dolt:
             assert name and not value, 'For get, only name is provided'
             args.extend(['--unset', name])
 
-        output = _execute(args, cwd).split('\n')
+        output = _execute(args, cwd).splitlines()
         result = {}
         for line in [l for l in output if l and '=' in l]:
             split = line.split(' = ')
@@ -1094,6 +1639,7 @@ class Dolt:
 
         return result
 
+    @_cached_read
     def ls(self, system: bool = False, all: bool = False) -> List[DoltTable]:
         """
         List the tables in the working set, the system tables, or all. Parses the tables and their object hash into an
@@ -1110,31 +1656,14 @@ class Dolt:
         if system:
             args.append('--system')
 
-        output = self.execute(args, print_output=False)
-        tables = []
-        system_pos = None
+        output = _execute_bytes(args, self.repo_dir())
+        header = _LS_SYSTEM_HEADER_RE.search(output)
+        table_rows, system_rows = (output[:header.start()], output[header.end():]) if header else (output, b'')
 
-        if len(output) == 3 and output[0] == 'No tables in working set':
-            return tables
-
-        for i, line in enumerate(output):
-            if line.startswith('Tables') or not line:
-                pass
-            elif line.startswith('System'):
-                system_pos = i
-                break
-            else:
-                if not line:
-                    pass
-                split = line.lstrip().split()
-                tables.append(DoltTable(split[0], split[1], split[2]))
-
-        if system_pos:
-            for line in output[system_pos:]:
-                if line.startswith('System'):
-                    pass
-                else:
-                    tables.append(DoltTable(line.strip(), system=True))
+        tables = [DoltTable(*[field.decode('utf-8') for field in match.groups()])
+                  for match in _LS_TABLE_ROW_RE.finditer(table_rows)]
+        tables.extend(DoltTable(match.group(1).decode('utf-8'), system=True)
+                      for match in _LS_SYSTEM_ROW_RE.finditer(system_rows))
 
         return tables
 
@@ -1151,9 +1680,11 @@ class Dolt:
             args.extend(['--filename', filename])
             _execute(args, self.repo_dir())
             return True
+        elif self._serving_sql():
+            logger.info(self._show_create_table(table))
+            return True
         else:
-            output = _execute(args, self.repo_dir())
-            logger.info('\n'.join(output))
+            logger.info(self.cached_read(('schema_export', table), lambda: _execute(args, self.repo_dir())))
             return True
 
     def schema_import(self,
@@ -1164,7 +1695,7 @@ class Dolt:
                       replace: bool = False,
                       dry_run: bool = False,
                       keep_types: bool = False,
-                      file_type: bool = False,
+                      file_type: str = None,
                       pks: List[str] = None,
                       map: str = None,
                       float_threshold: float = None,
@@ -1205,15 +1736,15 @@ class Dolt:
             args.append('--dry-run')
         if keep_types:
             args.append('--keep-types')
-        if file_type:
-            args.extend(['--file_type', file_type])
+        if file_type is not None:
+            args.extend(['--file-type', file_type])
         if pks:
             args.extend(['--pks', ','.join(pks)])
         if map:
             args.extend(['--map', map])
-        if float_threshold:
-            args.extend(['--float-threshold', float_threshold])
-        if delim:
+        if float_threshold is not None:
+            args.extend(['--float-threshold', str(float_threshold)])
+        if delim is not None:
             args.extend(['--delim', delim])
 
         args.extend([table, filename])
@@ -1228,32 +1759,35 @@ class Dolt:
         :param commit:
         :return:
         """
-        if type(table_or_tables) == str:
-            to_show = [table_or_tables]
-        else:
-            to_show = table_or_tables
+        if self._serving_sql() and not commit:
+            for table in _as_list(table_or_tables):
+                logger.info(self._show_create_table(table))
+            return
 
         args = ['schema', 'show']
 
         if commit:
             args.append(commit)
 
-        args.extend(to_show)
+        args.extend(_as_list(table_or_tables))
 
         self.execute(args)
 
+    def _show_create_table(self, table: str) -> str:
+        """
+        The CREATE TABLE statement for a table in the working set, read from the SQL server this repo is running.
+        :param table:
+        :return:
+        """
+        return self._sql_query('SHOW CREATE TABLE {}'.format(_quote_identifier(table)))[0]['Create Table']
+
     def table_rm(self, table_or_tables: Union[str, List[str]]):
         """
         Remove the table or list of tables provided from the working set.
         :param table_or_tables:
         :return:
         """
-        if type(table_or_tables) == str:
-            tables = [table_or_tables]
-        else:
-            tables = table_or_tables
-
-        self.execute(['rm', ' '.join(tables)])
+        self.execute(['table', 'rm'] + _as_list(table_or_tables))
 
     def table_import(self,
                      table: str,
@@ -1264,9 +1798,9 @@ class Dolt:
                      mapping_file: str = None,
                      pk: List[str] = None,
                      replace_table: bool = False,
-                     file_type: bool = None,
+                     file_type: str = None,
                      continue_importing: bool = False,
-                     delim: bool = None):
+                     delim: str = None):
         """
         Import a table from a filename, inferring the schema from the file. Operates in two possible modes, update,
         create, or replace. If creating must provide a primary key.
@@ -1296,13 +1830,13 @@ class Dolt:
         if replace_table:
             args.append('--replace')
             assert pk, 'When replace is set to True, pks must be provided'
-        if file_type:
-            args.extend(['--file_type', file_type])
+        if file_type is not None:
+            args.extend(['--file-type', file_type])
         if pk:
             args.extend(['--pks', ','.join(pk)])
         if mapping_file:
             args.extend(['--map', mapping_file])
-        if delim:
+        if delim is not None:
             args.extend(['--delim', delim])
         if continue_importing:
             args.append('--continue')
@@ -1350,7 +1884,7 @@ class Dolt:
         if pk:
             args.extend(['--pk', ','.join(pk)])
 
-        if file_type:
+        if file_type is not None:
             args.extend(['--file-type', file_type])
 
         args.extend([table, filename])
@@ -10,16 +10,20 @@ logger = get_logger(__name__)
 def read_table(repo: Dolt, table_name: str, delimiter: str = ',') -> pd.DataFrame:
     """
     Reads the contents of a table and returns it as a Pandas `DataFrame`. Under the hood this uses export and the
-    filesystem, in short order we are likley to replace this with use of the MySQL Server.
+    filesystem, in short order we are likley to replace this with use of the MySQL Server. The result is cached by the
+    repo until it changes, so reading a table again without writing to the repo in between does not export it again.
     :param repo:
     :param table_name:
     :param delimiter:
     :return:
     """
-    fp = tempfile.NamedTemporaryFile(suffix='.csv')
-    repo.execute(['table', 'export', table_name, fp.name, '-f'])
-    result = pd.read_csv(fp.name, delimiter=delimiter)
-    return result
+    def export():
+        fp = tempfile.NamedTemporaryFile(suffix='.csv')
+        repo.execute(['table', 'export', table_name, fp.name, '-f'], print_output=False, read_only=True)
+        return pd.read_csv(fp.name, delimiter=delimiter)
+
+    # the cached frame is shared, so hand out a copy callers are free to modify
+    return repo.cached_read(('read_table', table_name, delimiter), export).copy()
 
 
 def pandas_read_sql(query: str, engine: Engine) -> pd.DataFrame:
@@ -1,10 +1,12 @@
 import pytest
-from doltpy.core.dolt import Dolt, _execute, DoltException
+from doltpy.core.dolt import (Dolt, ServerConfig, _execute, _procedure_call, _sql_statement, _as_list,
+                              _parse_commit_date, _engine_reaches_server, _is_read_query, DoltException, CACHE_SIZE)
 from doltpy.core.write import UPDATE, import_df
 from doltpy.core.read import pandas_read_sql, read_table
 import shutil
 import pandas as pd
 import uuid
+from datetime import datetime
 import os
 from typing import Tuple, List
 from doltpy.core.tests.helpers import get_repo_path_tmp_path
@@ -66,6 +68,126 @@ def test_commit(create_test_table):
     assert repo.status().is_clean and len(repo.log()) == before_commit_count + 1
 
 
+def test_pipeline(create_test_table):
+    repo, test_table = create_test_table
+    message = 'Committed in a pipeline'
+    before_commit_count = len(repo.log())
+    with repo.pipeline():
+        repo.add(test_table)
+        repo.commit(message)
+        # nothing is executed until the pipeline exits
+        assert len(repo.log()) == before_commit_count
+
+    commits = list(repo.log().values())
+    assert repo.status().is_clean and len(commits) == before_commit_count + 1 and commits[0].message == message
+
+
+def test_pipeline_runs_queued_commands_first(create_test_table):
+    repo, test_table = create_test_table
+    with repo.pipeline():
+        repo.add(test_table)
+        repo.commit('Base')
+        # an import cannot be queued, so the add and commit above run before it
+        import_df(repo, test_table, pd.DataFrame([{'name': 'Roger', 'id': 3}]), ['id'], UPDATE)
+        repo.add(test_table)
+        repo.commit('Added Roger')
+
+    commits = list(repo.log().values())
+    assert repo.status().is_clean and [commit.message for commit in commits[:2]] == ['Added Roger', 'Base']
+
+
+def test_procedure_call():
+    assert _procedure_call(['add', 'players']) == "CALL DOLT_ADD('players')"
+    assert _procedure_call(['commit', '-m', "Rafa's win"]) == "CALL DOLT_COMMIT('-m', 'Rafa\\'s win')"
+    assert _procedure_call(['checkout', '-b', 'other']) == "CALL DOLT_CHECKOUT('-b', 'other')"
+
+
+def test_sql_statement():
+    assert _sql_statement(['add', 'players']) == "CALL DOLT_ADD('players')"
+    assert _sql_statement(['table', 'rm', 'players', 'teams']) == 'DROP TABLE `players`, `teams`'
+    assert _sql_statement(['table', 'mv', 'players', 'people']) == 'RENAME TABLE `players` TO `people`'
+    assert _sql_statement(['table', 'mv', '--force', 'players', 'people']) is None
+    assert _sql_statement(['table', 'import', '--update', 'players', 'players.csv']) is None
+
+
+def test_is_read_query():
+    assert _is_read_query('SELECT name, hash FROM dolt_branches')
+    assert _is_read_query('  show create table `players`')
+    assert not _is_read_query("CALL DOLT_COMMIT('-m', 'Added players')")
+    assert not _is_read_query('DROP TABLE `players`')
+
+
+def test_as_list():
+    assert _as_list('players') == ['players']
+    assert _as_list(['players', 'teams']) == ['players', 'teams']
+    assert _as_list(('players', )) == ['players']
+    assert _as_list(None) == []
+
+
+def test_parse_commit_date():
+    for value in ['Tue Jul 21 10:53:36 -0700 2020', 'Mon Jan  6 01:02:03 +0530 2020']:
+        assert _parse_commit_date(value) == datetime.strptime(value, '%a %b %d %H:%M:%S %z %Y')
+
+
+def test_cached_read_evicts_least_recently_used(tmp_path):
+    os.mkdir(os.path.join(tmp_path, '.dolt'))
+    repo = Dolt(str(tmp_path))
+    computed = []
+
+    def read(key):
+        return repo.cached_read(key, lambda: computed.append(key) or key)
+
+    for key in range(CACHE_SIZE):
+        read(key)
+    read(0)
+    read(CACHE_SIZE)
+    assert len(computed) == CACHE_SIZE + 1
+
+    # 1 was the least recently used when CACHE_SIZE was added, 0 was used again just before
+    read(0)
+    read(1)
+    assert computed[CACHE_SIZE + 1:] == [1]
+
+
+def test_cached_read_sees_appended_chunks(tmp_path):
+    noms = os.path.join(tmp_path, '.dolt', 'noms')
+    os.makedirs(noms)
+    journal = os.path.join(noms, 'journal')
+    with open(journal, 'w') as f:
+        f.write('chunk')
+    repo = Dolt(str(tmp_path))
+    computed = []
+
+    def read():
+        return repo.cached_read(('status', ), lambda: computed.append(1))
+
+    read()
+    read()
+    assert len(computed) == 1
+
+    # appending to an existing file leaves the modification time of the directory unchanged
+    noms_mtime = os.stat(noms).st_mtime_ns
+    with open(journal, 'a') as f:
+        f.write('another chunk')
+    assert os.stat(noms).st_mtime_ns == noms_mtime
+    read()
+    assert len(computed) == 2
+
+
+def test_read_table_keeps_cache(create_test_table):
+    repo, test_table = create_test_table
+    first = read_table(repo, test_table)
+    expected = first.copy()
+    first['extra'] = 1
+    assert 'extra' not in read_table(repo, test_table).columns
+
+    # values modified in place on a result must not reach the cached frame either
+    modified = read_table(repo, test_table)
+    modified.loc[0, 'id'] = 99
+    modified.iloc[:, 0] = -1
+    assert read_table(repo, test_table).equals(expected)
+
+
 def test_merge_fast_forward(create_test_table):
     repo, test_table = create_test_table
     message_one = 'Base branch'
@@ -281,6 +403,87 @@ def test_sql_server_unique(create_test_table, run_serve_mode, init_other_empty_t
     assert {'information_schema', other_repo.repo_name} == set(other_repo_databases)
 
 
+def test_sql_server_status_add_commit(create_test_table, run_serve_mode):
+    repo, test_table = create_test_table
+    status = repo.status()
+    assert not status.is_clean and status.added_tables == {test_table: False}
+
+    repo.add(test_table)
+    assert repo.status().added_tables == {test_table: True}
+
+    message = 'Committed while serving'
+    repo.commit(message)
+    assert repo.status().is_clean and list(repo.log().values())[0].message == message
+
+
+def test_sql_server_custom_user(create_test_table):
+    repo, test_table = create_test_table
+    repo.server_config = ServerConfig(user='writer', password='secret')
+    repo.sql_server()
+    try:
+        # the engine cannot log in as this user, so reads and commands keep using the CLI
+        assert repo.status().added_tables == {test_table: False}
+        repo.add(test_table)
+        repo.commit('Committed while serving as writer')
+        assert repo.status().is_clean
+    finally:
+        repo.sql_server_stop()
+
+
+def test_engine_reaches_server():
+    assert _engine_reaches_server(ServerConfig())
+    assert _engine_reaches_server(ServerConfig(port=3307, loglevel='trace'))
+    assert not _engine_reaches_server(ServerConfig(config='server.yaml'))
+    assert not _engine_reaches_server(ServerConfig(user='writer', password='secret'))
+    assert not _engine_reaches_server(ServerConfig(multi_db_dir='dbs'))
+
+
+def test_sql_server_checkout_write_commit(create_test_table, run_serve_mode):
+    repo, test_table = create_test_table
+    repo.add(test_table)
+    repo.commit('Base')
+
+    # the server is restarted on the new branch, so writes over any connection, and the commit, land on it
+    repo.checkout('other', checkout_branch=True)
+    with repo.get_engine().connect() as conn:
+        conn.execute("INSERT INTO {} (name, id) VALUES ('Roger', 3)".format(test_table))
+    repo.add(test_table)
+    repo.commit('Added Roger')
+
+    active_branch, _ = repo.branch()
+    assert active_branch.name == 'other' and list(repo.log().values())[0].message == 'Added Roger'
+    assert 3 in list(read_table(repo, test_table)['id'])
+
+    repo.checkout('master')
+    assert list(repo.log().values())[0].message == 'Base'
+    assert 3 not in list(read_table(repo, test_table)['id'])
+
+
+def test_sql_server_branch(create_test_table, run_serve_mode):
+    repo, _ = create_test_table
+    active_branch, branches = repo.branch()
+    assert [active_branch.name] == [branch.name for branch in branches] == ['master']
+
+
+def test_sql_server_remote(create_test_table, run_serve_mode):
+    repo, _ = create_test_table
+    assert repo.remote() == []
+
+    repo.sql_server_stop()
+    repo.remote(add=True, name='origin', url='https://doltremoteapi.dolthub.com/liquidata/test')
+    repo.sql_server()
+    remotes = repo.remote()
+    assert [(remote.name, remote.url) for remote in remotes] == [
+        ('origin', 'https://doltremoteapi.dolthub.com/liquidata/test')
+    ]
+
+
+def test_sql_server_schema_show(create_test_table, run_serve_mode):
+    repo, test_table = create_test_table
+    repo.schema_show(test_table)
+    assert repo._show_create_table(test_table).startswith('CREATE TABLE `{}`'.format(test_table))
+
+
 def test_branch(create_test_table):
     repo, _ = create_test_table
     active_branch, branches = repo.branch()
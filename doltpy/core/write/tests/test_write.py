@@ -1,6 +1,7 @@
-from doltpy.core.write import import_dict, import_list
-from doltpy.core.read import pandas_read_sql
+from doltpy.core.write import import_dict, import_list, import_df, bulk_import, CREATE, UPDATE
+from doltpy.core.read import pandas_read_sql, read_table
 import pandas as pd
+import io
 from datetime import datetime, date
 import pytest
 
@@ -81,3 +82,18 @@ def test_import_lists_uneven(init_empty_test_repo, run_serve_mode):
         import_dict(repo, 'players', DICT_OF_LISTS_UNEVEN_LENGTHS, ['name'], 'create')
 
 
+def test_bulk_import_failing_stream(init_empty_test_repo):
+    repo = init_empty_test_repo
+    import_df(repo, 'players', pd.DataFrame([{'name': 'Rafael', 'id': 1}]), ['id'], CREATE)
+
+    class FailingStream(io.StringIO):
+        def read(self, size=-1):
+            # hand over the header and the first row, then fail
+            if self.tell():
+                raise IOError('Stream failed')
+            return self.readline() + self.readline()
+
+    with pytest.raises(IOError):
+        bulk_import(repo, 'players', FailingStream('name,id\nRoger,2\nNovak,3\n'), ['id'], UPDATE)
+
+    assert list(read_table(repo, 'players')['name']) == ['Rafael']
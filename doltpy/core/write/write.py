@@ -8,10 +8,12 @@ from datetime import datetime, date, time
 from sqlalchemy import String, DateTime, Date, Integer, Float, Table, MetaData, Column
 import math
 import os
+import shutil
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_BATCH_SIZE = 300000
+STDIN_PATH = '/dev/stdin'
 CREATE, FORCE_CREATE, REPLACE, UPDATE = 'create', 'force_create', 'replace', 'update'
 IMPORT_MODES_TO_FLAGS = {CREATE: ['-c'],
                          FORCE_CREATE: ['-f', '-c'],
@@ -35,9 +37,9 @@ def import_df(repo: Dolt,
     :param import_mode:
     :return:
     """
-    def writer(filepath: str):
+    def writer(f: io.TextIOBase):
         clean = data.dropna(subset=primary_keys)
-        clean.to_csv(filepath, index=False)
+        clean.to_csv(f, index=False)
 
     _import_helper(repo, table_name, writer, primary_keys, import_mode)
 
@@ -59,16 +61,15 @@ def bulk_import(repo: Dolt,
     :param import_mode:
     :return:
     """
-    def writer(filepath: str):
-        with open(filepath, 'w') as f:
-            f.writelines(data.readlines())
+    def writer(f: io.TextIOBase):
+        shutil.copyfileobj(data, f)
 
     _import_helper(repo, table_name, writer, primary_keys, import_mode)
 
 
 def _import_helper(repo: Dolt,
                    table_name: str,
-                   write_import_file: Callable[[str], None],
+                   write_import_data: Callable[[io.TextIOBase], None],
                    primary_keys: List[str],
                    import_mode: str) -> None:
     import_modes = IMPORT_MODES_TO_FLAGS.keys()
@@ -90,12 +91,19 @@ def _import_helper(repo: Dolt,
                                                                                                repo.repo_dir(),
                                                                                                import_mode))
 
-    fname = tempfile.mktemp (suffix='.csv')
+    args = ['table', 'import', table_name] + import_flags
+    if import_mode == CREATE:
+        args += ['--pk={}'.format(','.join(primary_keys))]
+
+    # Where possible the data is streamed to dolt as it is written, rather than written to a file dolt reads back
+    if os.path.exists(STDIN_PATH):
+        repo.execute(args + ['--file-type', 'csv', STDIN_PATH], write_stdin=write_import_data)
+        return
+
+    fname = tempfile.mktemp(suffix='.csv')
     try:
-        write_import_file(fname)
-        args = ['table', 'import', table_name] + import_flags
-        if import_mode == CREATE:
-            args += ['--pk={}'.format(','.join(primary_keys))]
+        with open(fname, 'w', newline='') as f:
+            write_import_data(f)
 
         repo.execute(args + [fname])
     finally:
@@ -1,15 +1,35 @@
-from .wrappers import load_to_dolt, load_to_dolthub
-from .loaders import (get_df_table_writer,
-                      get_bulk_table_writer,
-                      get_unique_key_table_writer,
-                      get_dolt_loader,
-                      get_branch_creator,
-                      get_table_transformer,
-                      insert_unique_key,
-                      create_table_from_schema_import,
-                      create_table_from_schema_import_unique_key,
-                      DoltTableWriter,
-                      DoltLoader)
+import importlib
 from ..core.system_helpers import register_cleanup
 
+# The loaders and wrappers pull in pandas, so they are only imported when one of their names is first used
+_LAZY_IMPORTS = {'load_to_dolt': 'wrappers',
+                 'load_to_dolthub': 'wrappers',
+                 'get_df_table_writer': 'loaders',
+                 'get_bulk_table_writer': 'loaders',
+                 'get_unique_key_table_writer': 'loaders',
+                 'get_dolt_loader': 'loaders',
+                 'get_branch_creator': 'loaders',
+                 'get_table_transformer': 'loaders',
+                 'insert_unique_key': 'loaders',
+                 'create_table_from_schema_import': 'loaders',
+                 'create_table_from_schema_import_unique_key': 'loaders',
+                 'DoltTableWriter': 'loaders',
+                 'DoltLoader': 'loaders'}
+
+__all__ = list(_LAZY_IMPORTS) + ['register_cleanup']
+
+
+def __getattr__(name: str):
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError('module {} has no attribute {}'.format(__name__, name))
+
+    value = getattr(importlib.import_module('.' + _LAZY_IMPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
+
+
 register_cleanup()
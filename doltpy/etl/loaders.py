@@ -8,15 +8,17 @@ import pandas as pd
 import hashlib
 import itertools
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 
 DoltTableWriter = Callable[[Dolt], str]
 DoltLoader = Callable[[Dolt], str]
 DataframeTransformer = Callable[[pd.DataFrame], pd.DataFrame]
-FileTransformer = Callable[[io.StringIO], io.StringIO]
+FileTransformer = Callable[[io.StringIO], Union[io.StringIO, pd.DataFrame]]
 
 logger = get_logger(__name__)
 INSERTED_ROW_HASH_COL = 'hash_id'
 INSERTED_COUNT_COL = 'count'
+MAX_WRITER_THREADS = 8
 
 
 def _apply_df_transformers(data: pd.DataFrame, transformers: List[DataframeTransformer]) -> pd.DataFrame:
@@ -28,7 +30,8 @@ def _apply_df_transformers(data: pd.DataFrame, transformers: List[DataframeTrans
     return temp
 
 
-def _apply_file_transformers(data: io.StringIO, transformers: List[FileTransformer]) -> io.StringIO:
+def _apply_file_transformers(data: io.StringIO,
+                             transformers: List[FileTransformer]) -> Union[io.StringIO, pd.DataFrame]:
     data.seek(0)
     if not transformers:
         return data
@@ -48,7 +51,9 @@ def get_bulk_table_writer(table: str,
     Returns a function that takes a Dolt repository object and writes the contents of the file like object returned by
     the function parameter `get_data` to the table specified using the primary keys passed. Optionally toggle the import
     mode and apply a list of transformers to do some data cleaning operations. For example, we might apply a transformer
-    that converts some date strings to proper datetime objects.
+    that converts some date strings to proper datetime objects. The last transformer may return a `DataFrame` rather
+    than a file like object, for example when it parses the data to clean it, in which case the `DataFrame` is imported
+    as is rather than being written back out to a file like object first.
     :param table:
     :param get_data:
     :param pk_cols:
@@ -59,7 +64,10 @@ def get_bulk_table_writer(table: str,
     def inner(repo: Dolt):
         _import_mode = import_mode or ('create' if table not in [t.name for t in repo.ls()] else 'update')
         data_to_load = _apply_file_transformers(get_data(), transformers)
-        bulk_import(repo, table, data_to_load, pk_cols, import_mode=_import_mode)
+        if isinstance(data_to_load, pd.DataFrame):
+            import_df(repo, table, data_to_load, pk_cols, import_mode=_import_mode)
+        else:
+            bulk_import(repo, table, data_to_load, pk_cols, import_mode=_import_mode)
         return table
 
     return inner
@@ -143,11 +151,14 @@ def insert_unique_key(df: pd.DataFrame) -> pd.DataFrame:
     :return:
     """
     assert INSERTED_ROW_HASH_COL not in df.columns and INSERTED_COUNT_COL not in df.columns, 'Require hash_id and count not in df'
-    ids = df.apply(lambda r: hashlib.md5(','.join([str(el) for el in r]).encode('utf-8')).hexdigest(), axis=1)
-    with_id = df.assign(hash_id=ids).set_index(INSERTED_ROW_HASH_COL)
-    count_by_id = with_id.groupby(INSERTED_ROW_HASH_COL).size()
-    with_id.loc[:, INSERTED_COUNT_COL] = count_by_id
-    unique = with_id.reset_index().drop_duplicates(subset=[INSERTED_ROW_HASH_COL])
+    # Hash the rows of the underlying array directly, rather than building a Series per row via apply, the values and
+    # so the hashes are the same
+    ids = pd.Series([hashlib.md5(','.join([str(el) for el in row]).encode('utf-8')).hexdigest()
+                     for row in df.to_numpy()], dtype=object)
+    with_id = df.reset_index(drop=True)
+    with_id.insert(0, INSERTED_ROW_HASH_COL, ids)
+    with_id[INSERTED_COUNT_COL] = ids.map(ids.value_counts())
+    unique = with_id.drop_duplicates(subset=[INSERTED_ROW_HASH_COL])
     return unique
 
 
@@ -195,22 +206,23 @@ def get_dolt_loader(writer_or_writers: Union[DoltTableWriter, List[DoltTableWrit
                     commit: bool,
                     message: str,
                     branch: str = 'master',
-                    transaction_mode: bool = None) -> DoltLoader:
+                    transaction_mode: bool = None,
+                    parallel: bool = False) -> DoltLoader:
     """
     Given a repo and a set of table loaders, run the table loaders and conditionally commit the results with the
     specified message on the specified branch. If transaction_mode is true then ensure all loaders/transformers are
-    successful, or all are rolled back.
+    successful, or all are rolled back. Writers run one after the other in the order given, so a writer can read a
+    table written by one before it. If parallel is true they instead run concurrently, which is only safe when the
+    writers are independent, that is no writer reads a table another one writes.
     :param writer_or_writers:
     :param commit:
     :param message:
     :param branch:
     :param transaction_mode:
+    :param parallel: run writers concurrently, they must be independent of one another
     :return: the branch written to
     """
-    if type(writer_or_writers) == list:
-        writers = writer_or_writers
-    else:
-        writers = [writer_or_writers]
+    writers = writer_or_writers if isinstance(writer_or_writers, list) else [writer_or_writers]
 
     def inner(repo: Dolt):
         current_branch, current_branch_list = repo.branch()
@@ -229,7 +241,12 @@ def get_dolt_loader(writer_or_writers: Union[DoltTableWriter, List[DoltTableWrit
         if transaction_mode:
             raise NotImplementedError('transaction_mode is not yet implemented')
 
-        tables_updated = [writer(repo) for writer in writers]
+        if parallel:
+            # Writers prepare their data concurrently, the dolt commands they run are serialized by the repo
+            with ThreadPoolExecutor(max_workers=max(1, min(MAX_WRITER_THREADS, len(writers)))) as executor:
+                tables_updated = list(executor.map(lambda writer: writer(repo), writers))
+        else:
+            tables_updated = [writer(repo) for writer in writers]
 
         if commit:
             if not repo.status().is_clean:
@@ -49,13 +49,17 @@ def update_test_data(initial_test_data):
     return _populate_test_data_helper(initial_test_data, UPDATE_MENS, UPDATE_WOMENS)
 
 
-def get_raw_data(repo: Dolt):
-    return pd.concat([read_table(repo, MENS_MAJOR_COUNT).assign(gender='mens'),
-                      read_table(repo, WOMENS_MAJOR_COUNT).assign(gender='womens')])
+def get_raw_data(repo: Dolt) -> pd.DataFrame:
+    # aggregate each table as it is read rather than concatenating both tables and grouping the result
+    counts = {'mens': read_table(repo, MENS_MAJOR_COUNT)['major_count'],
+              'womens': read_table(repo, WOMENS_MAJOR_COUNT)['major_count']}
+    return pd.DataFrame({'gender': list(counts),
+                         'sum': [count.sum() for count in counts.values()],
+                         'size': [count.size for count in counts.values()]})
 
 
 def averager(df: pd.DataFrame) -> pd.DataFrame:
-    return df.groupby('gender').mean().reset_index()[['gender', 'major_count']].rename(columns={'major_count': 'average'})
+    return pd.DataFrame({'gender': df['gender'], 'average': df['sum'] / df['size']})
 
 
 @pytest.fixture
@@ -220,18 +224,10 @@ def test_get_bulk_table_loader(init_empty_test_repo):
         return io.StringIO(CORRUPT_CSV)
 
     def cleaner(data: io.StringIO) -> io.StringIO:
-        output = io.StringIO()
-        header_line = data.readline()
-        columns = header_line.split(',')
-        output.write(header_line)
-        for l in data.readlines():
-            if len(l.split(',')) != len(columns):
-                print('Corrupt line, discarding:\n{}'.format(l))
-            else:
-                output.write(l)
-
-        output.seek(0)
-        return output
+        # lines with a different number of fields than the header are corrupt, count separators rather than split
+        header, *lines = data.read().splitlines(keepends=True)
+        separators = header.count(',')
+        return io.StringIO(header + ''.join(line for line in lines if line.count(',') == separators))
 
     get_bulk_table_writer(table, get_data, ['player_name'], import_mode=CREATE, transformers=[cleaner])(repo)
     actual = read_table(repo, table)
@@ -245,6 +241,41 @@ def test_get_bulk_table_loader(init_empty_test_repo):
                 players_to_week_counts[player_name] == int(weeks_at_number_1.rstrip()))
 
 
+def test_get_bulk_table_loader_df_transformer(init_empty_test_repo):
+    repo = init_empty_test_repo
+    table = 'test_table'
+
+    def get_data():
+        return io.StringIO(CLEANED_CSV)
+
+    get_bulk_table_writer(table, get_data, ['player_name'], import_mode=CREATE, transformers=[pd.read_csv])(repo)
+    actual = read_table(repo, table)
+    expected = pd.read_csv(io.StringIO(CLEANED_CSV))
+    assert actual.set_index('player_name')['weeks_at_number_1'].to_dict() == \
+        expected.set_index('player_name')['weeks_at_number_1'].to_dict()
+
+
+def test_dolt_loader_writers_run_in_order(init_empty_test_repo):
+    repo = init_empty_test_repo
+    # the second writer reads the table the first one writes
+    writers = [get_df_table_writer(MENS_MAJOR_COUNT, lambda: INITIAL_MENS, ['name'], import_mode=CREATE),
+               get_df_table_writer(WOMENS_MAJOR_COUNT,
+                                   lambda: read_table(repo, MENS_MAJOR_COUNT),
+                                   ['name'],
+                                   import_mode=CREATE)]
+    get_dolt_loader(writers, True, 'Loaded dependent tables')(repo)
+    assert list(read_table(repo, WOMENS_MAJOR_COUNT)['name']) == ['Roger']
+
+
+def test_dolt_loader_parallel(init_empty_test_repo):
+    repo = init_empty_test_repo
+    writers = [get_df_table_writer(MENS_MAJOR_COUNT, lambda: INITIAL_MENS, ['name'], import_mode=CREATE),
+               get_df_table_writer(WOMENS_MAJOR_COUNT, lambda: INITIAL_WOMENS, ['name'], import_mode=CREATE)]
+    get_dolt_loader(writers, True, 'Loaded independent tables', parallel=True)(repo)
+    assert list(read_table(repo, MENS_MAJOR_COUNT)['name']) == ['Roger']
+    assert list(read_table(repo, WOMENS_MAJOR_COUNT)['name']) == ['Serena']
+
+
 def test_load_to_dolt_new_branch(initial_test_data):
     repo = initial_test_data
     test_branch = 'new-branch'
@@ -27,10 +27,7 @@ def load_to_dolthub(loader_or_loaders: Union[DoltLoader, List[DoltLoader]],
     :param remote_url:
     :return:
     """
-    if type(loader_or_loaders) == list:
-        loaders = loader_or_loaders
-    else:
-        loaders = [loader_or_loaders]
+    loaders = loader_or_loaders if isinstance(loader_or_loaders, list) else [loader_or_loaders]
 
     if clone:
         assert remote_url, 'If clone is True then remote must be passed'
@@ -71,10 +68,7 @@ def load_to_dolt(loader_or_loaders: Union[DoltLoader, List[DoltLoader]], dolt_di
     :param dry_run:
     :return:
     """
-    if type(loader_or_loaders) == list:
-        loaders = loader_or_loaders
-    else:
-        loaders = [loader_or_loaders]
+    loaders = loader_or_loaders if isinstance(loader_or_loaders, list) else [loader_or_loaders]
 
     logger.info(
         '''Commencing load to Dolt with the following options:
@@ -12,6 +12,7 @@ setup(name='doltpy',
                         'psutil>=5.7.0',
                         'SQLAlchemy>=1.3.18',
                         'cx-Oracle>=8.0.1'],
+      extras_require={'orjson': ['orjson>=3.0.0']},
       tests_require=['pytest-docker>=0.7.2', 'PyYAML', 'pytest'],
       setup_requires=['wheel'],
       author='DoltHub',